@@ -1,244 +1,314 @@
+import os
+import sys
 import time
-import json
+import asyncio
+import inspect
 import threading
-import requests
-import copy
-from concurrent.futures import ThreadPoolExecutor
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import atomics
+import orjson
+
+try:
+    import uvloop
+    run_async = uvloop.run
+except ModuleNotFoundError:  # uvloop is optional; fall back to the stock asyncio loop
+    run_async = asyncio.run
 
 NUM_ACCOUNTS = 5
 NUM_AGENTS = 5
 INITIAL_BALANCE = 100
 
+# Account state lives in memory so the benchmark measures the concurrency algorithms
+# rather than JSON file I/O. Each account is one 64-bit atomic word packing a 32-bit
+# version over a 32-bit balance, which lets OCC validate and commit a slot with a
+# single hardware compare-and-swap.
+# The account_{i}.json files are only written on reset and after each run,
+# through descriptors that stay open for the whole benchmark.
+ACCOUNTS = [atomics.atomic(width=8, atype=atomics.UINT) for _ in range(NUM_ACCOUNTS)]
+ACCOUNT_FDS = []
+
+def pack_account(balance, version):
+    return (version << 32) | (balance & 0xFFFFFFFF)
+
+def unpack_account(word):
+    balance = word & 0xFFFFFFFF
+    if balance & 0x80000000: # Sign-extend so overdrawn balances read back negative
+        balance -= 1 << 32
+    return balance, word >> 32
+
+def open_account_files():
+    if not ACCOUNT_FDS:
+        ACCOUNT_FDS.extend(os.open(f"account_{i}.json", os.O_RDWR | os.O_CREAT, 0o644) for i in range(NUM_ACCOUNTS))
+
+def close_account_files():
+    while ACCOUNT_FDS:
+        os.close(ACCOUNT_FDS.pop())
+
+def flush_accounts():
+    for i, fd in enumerate(ACCOUNT_FDS):
+        balance, version = read_account(i)
+        payload = orjson.dumps({"balance": balance, "version": version})
+        # Overwrite in place, then trim any leftover bytes from a longer previous write
+        os.pwrite(fd, payload, 0)
+        os.ftruncate(fd, len(payload))
+
+def merge_metrics(metrics, metrics_lock, counts):
+    # Agents count into a private Counter and take the shared lock once, on exit
+    with metrics_lock:
+        for key, value in counts.items():
+            metrics[key] += value
+
 def reset_accounts():
+    open_account_files()
     for i in range(NUM_ACCOUNTS):
-        with open(f"account_{i}.json", "w") as f:
-            json.dump({"balance": INITIAL_BALANCE, "version": 0}, f)
+        write_account(i, INITIAL_BALANCE, 0)
+    flush_accounts()
 
 def read_account(i):
-    with open(f"account_{i}.json", "r") as f:
-        return json.load(f)
+    return unpack_account(ACCOUNTS[i].load())
+
+def write_account(i, balance, version):
+    ACCOUNTS[i].store(pack_account(balance, version))
 
-def write_account(i, data):
-    with open(f"account_{i}.json", "w") as f:
-        json.dump(data, f)
+def compare_and_swap_account(i, expected_word, balance, version):
+    return ACCOUNTS[i].cmpxchg_strong(expected=expected_word, desired=pack_account(balance, version)).success
 
 # ==========================================
 # 1. CHAOS (No Locks - Data Loss)
 # ==========================================
 def run_chaos_agent(agent_id, acc_from, acc_to, metrics, metrics_lock):
+    counts = Counter()
     try:
-        data_from = read_account(acc_from)
-        data_to = read_account(acc_to)
+        bal_from, ver_from = read_account(acc_from)
+        bal_to, ver_to = read_account(acc_to)
         
         # Simulate LLM thinking / network latency
         time.sleep(0.1)
         
-        data_from["balance"] -= 10
-        data_from["version"] += 1
-        write_account(acc_from, data_from)
+        # Write back from the pre-sleep snapshot. Re-reading the accounts after the
+        # sleep would close the race window, so Chaos would stop losing the updates
+        # this baseline exists to show; the plain word stores are the no-sync floor.
+        write_account(acc_from, bal_from - 10, ver_from + 1)
+        write_account(acc_to, bal_to + 10, ver_to + 1)
         
-        data_to["balance"] += 10
-        data_to["version"] += 1
-        write_account(acc_to, data_to)
-        
-        with metrics_lock:
-            metrics["success"] += 1
+        counts["success"] += 1
     except Exception as e:
-        with metrics_lock:
-            metrics["errors"] += 1
+        counts["errors"] += 1
+    merge_metrics(metrics, metrics_lock, counts)
 
 # ==========================================
-# 2. PESSIMISTIC (Standard Mutex - Deadlocks)
+# 2. PESSIMISTIC (Ordered Mutex - Serialized)
 # ==========================================
 mutex_locks = {i: threading.Lock() for i in range(NUM_ACCOUNTS)}
 
 def run_pessimistic_agent(agent_id, acc_from, acc_to, metrics, metrics_lock):
+    counts = Counter()
     try:
-        # A deadlock happens if two threads try to lock the same locks in reverse order
-        # We try to acquire them sequentially
-        # Add a timeout so it doesn't freeze the whole benchmark forever
-        acquired_from = mutex_locks[acc_from].acquire(timeout=2.0)
-        if not acquired_from:
-            with metrics_lock:
-                metrics["deadlocks_detected"] += 1
-            return
+        # Locking in reverse order across threads is what deadlocks a circular transfer.
+        # Acquiring both locks in ascending account order rules out the circular wait,
+        # so no timeout or back-off is needed.
+        first, second = sorted((acc_from, acc_to))
+        with mutex_locks[first]:
+            time.sleep(0.05) # Yield to encourage interleaving
             
-        time.sleep(0.05) # Yield to encourage interleaving/deadlocks
-        
-        acquired_to = mutex_locks[acc_to].acquire(timeout=2.0)
-        if not acquired_to:
-            mutex_locks[acc_from].release() # Back off if deadlock
-            with metrics_lock:
-                metrics["deadlocks_detected"] += 1
-            return
-
-        # Critical Section
-        data_from = read_account(acc_from)
-        data_to = read_account(acc_to)
-        time.sleep(0.1) # Simulate LLM thinking
-        data_from["balance"] -= 10
-        write_account(acc_from, data_from)
-        data_to["balance"] += 10
-        write_account(acc_to, data_to)
-
-        mutex_locks[acc_to].release()
-        mutex_locks[acc_from].release()
+            with mutex_locks[second]:
+                # Critical Section
+                bal_from, ver_from = read_account(acc_from)
+                bal_to, ver_to = read_account(acc_to)
+                time.sleep(0.1) # Simulate LLM thinking
+                write_account(acc_from, bal_from - 10, ver_from + 1)
+                write_account(acc_to, bal_to + 10, ver_to + 1)
         
-        with metrics_lock:
-            metrics["success"] += 1
+        counts["success"] += 1
     except Exception as e:
-        with metrics_lock:
-            metrics["errors"] += 1
+        counts["errors"] += 1
+    merge_metrics(metrics, metrics_lock, counts)
 
 # ==========================================
 # 3. OPTIMISTIC (OCC - High Aborts under contention)
 # ==========================================
-occ_cas_lock = threading.Lock()
+def credit_account(i, amount):
+    # Lock-free add: retry the CAS until no other writer slipped in between
+    while True:
+        word = ACCOUNTS[i].load()
+        balance, version = unpack_account(word)
+        if compare_and_swap_account(i, word, balance + amount, version + 1):
+            return
 
 def run_optimistic_agent(agent_id, acc_from, acc_to, metrics, metrics_lock):
+    counts = Counter()
     max_retries = 10
     for _ in range(max_retries):
         try:
-            from_before = read_account(acc_from)
-            to_before = read_account(acc_to)
+            # The read set is the two packed words; their versions are what each CAS validates
+            from_before = ACCOUNTS[acc_from].load()
+            to_before = ACCOUNTS[acc_to].load()
             
             time.sleep(0.1) # Simulate LLM thinking
             
-            # ATOMIC COMPARE AND SWAP
-            with occ_cas_lock:
-                from_now = read_account(acc_from)
-                to_now = read_account(acc_to)
-                
-                if from_now["version"] != from_before["version"] or to_now["version"] != to_before["version"]:
-                    # Collision detected! Abort and retry
-                    with metrics_lock:
-                        metrics["aborts"] += 1
-                    continue
-                    
-                from_now["balance"] -= 10
-                from_now["version"] += 1
-                write_account(acc_from, from_now)
-                
-                to_now["balance"] += 10
-                to_now["version"] += 1
-                write_account(acc_to, to_now)
+            # ATOMIC COMPARE AND SWAP: each account validates and commits in one instruction
+            bal_from, ver_from = unpack_account(from_before)
+            bal_to, ver_to = unpack_account(to_before)
+            if not compare_and_swap_account(acc_from, from_before, bal_from - 10, ver_from + 1):
+                # Collision detected! Abort and retry
+                counts["aborts"] += 1
+                continue
+            
+            if not compare_and_swap_account(acc_to, to_before, bal_to + 10, ver_to + 1):
+                # Collision on the second account: refund the debit, then abort and retry
+                credit_account(acc_from, 10)
+                counts["aborts"] += 1
+                continue
                 
             # If we get here, CAS succeeded
-            with metrics_lock:
-                metrics["success"] += 1
-            return
+            counts["success"] += 1
+            break
             
         except Exception:
             pass
-            
-    with metrics_lock:
-        metrics["failed_retries"] += 1
+    else:
+        counts["failed_retries"] += 1
+    merge_metrics(metrics, metrics_lock, counts)
 
 # ==========================================
 # 4. KLOCK (Wait-Die - Deadlock Prevention)
 # ==========================================
-from klock import KlockHttpClient
+from klock_langchain import backoff_delay
+from klock_langchain.client import AsyncKlockHttpClient, KlockHttpClient
 
+# The native client auto-starts the local daemon; the asyncio agents below then
+# talk to it directly so N agents wait on the network without N OS threads.
+# KLOCK_HTTP2=1 multiplexes them over one HTTP/2 connection; that needs a klock
+# server built from this tree (axum's http2 feature), so HTTP/1.1 is the default.
+KLOCK_HTTP2 = os.environ.get("KLOCK_HTTP2", "").strip().lower() in ("1", "true", "yes", "on")
 klock = KlockHttpClient()
+aklock = AsyncKlockHttpClient(http2=KLOCK_HTTP2)
 
-def run_klock_agent(agent_id, acc_from, acc_to, metrics, metrics_lock, priority):
-    klock.register_agent(agent_id, priority)
-    
+# Releases on the WAIT/DIE retry paths don't gate correctness (the lease TTL would
+# reclaim them anyway), so they run as background tasks instead of costing the
+# retry a round trip. run_async_agents drains them before the run ends.
+pending_releases = set()
+
+def release_in_background(lease_id):
+    task = asyncio.create_task(aklock.release_lease(lease_id))
+    pending_releases.add(task)
+    task.add_done_callback(pending_releases.discard)
+
+async def run_klock_agent(agent_id, acc_from, acc_to, metrics, metrics_lock, priority):
+    # The agent registers lazily: its priority rides along on every acquire_lease
+    counts = Counter()
     max_retries = 10
-    for _ in range(max_retries):
-        lease_from = None
-        lease_to = None
-        try:
-            # 1. Acquire FROM
-            res = klock.acquire_lease(agent_id, f"sess_{agent_id}", "FILE", str(acc_from), "MUTATES", 10000)
-            if not res.get("success"):
-                status = res.get("reason")
-                wait_time = res.get("wait_time", 100)
-                if status == "WAIT":
-                    with metrics_lock: metrics["waits"] += 1
-                    time.sleep(wait_time / 1000.0)
-                    continue
-                elif status == "DIE":
-                    with metrics_lock: metrics["dies"] += 1
-                    time.sleep(wait_time / 1000.0)
-                    continue
-                else:
-                    continue
-            lease_from = res["lease_id"]
+    # Merge even if an agent crashes so its counted waits and dies still reach the totals
+    try:
+        for attempt in range(max_retries):
+            lease_from = None
+            lease_to = None
+            try:
+                # 1. Acquire FROM
+                res = await aklock.acquire_lease(agent_id, f"sess_{agent_id}", "FILE", str(acc_from), "MUTATES", 10000, priority=priority)
+                if not res.get("success"):
+                    status = res.get("reason")
+                    wait_time = res.get("wait_time", 100)
+                    if status == "WAIT":
+                        counts["waits"] += 1
+                        await asyncio.sleep(backoff_delay(wait_time, attempt))
+                        continue
+                    elif status == "DIE":
+                        counts["dies"] += 1
+                        await asyncio.sleep(backoff_delay(wait_time, attempt))
+                        continue
+                    else:
+                        continue
+                lease_from = res["lease_id"]
             
-            time.sleep(0.05) # encourage interleaving
+                await asyncio.sleep(0.05) # encourage interleaving
             
-            # 2. Acquire TO
-            res = klock.acquire_lease(agent_id, f"sess_{agent_id}", "FILE", str(acc_to), "MUTATES", 10000)
-            if not res.get("success"):
-                status = res.get("reason")
-                wait_time = res.get("wait_time", 100)
-                if status == "WAIT":
-                    with metrics_lock: metrics["waits"] += 1
-                    time.sleep(wait_time / 1000.0)
-                    if lease_from: klock.release_lease(lease_from)
-                    continue
-                elif status == "DIE":
-                    # Wait-Die preventing deadlock!
-                    with metrics_lock: metrics["dies"] += 1
-                    if lease_from: klock.release_lease(lease_from)
-                    time.sleep(wait_time / 1000.0)
-                    continue
-                else:
-                    if lease_from: klock.release_lease(lease_from)
-                    continue
-            lease_to = res["lease_id"]
-
-            # Critical Section
-            data_from = read_account(acc_from)
-            data_to = read_account(acc_to)
-            time.sleep(0.1) # Simulate LLM
-            data_from["balance"] -= 10
-            write_account(acc_from, data_from)
-            data_to["balance"] += 10
-            write_account(acc_to, data_to)
+                # 2. Acquire TO
+                res = await aklock.acquire_lease(agent_id, f"sess_{agent_id}", "FILE", str(acc_to), "MUTATES", 10000, priority=priority)
+                if not res.get("success"):
+                    status = res.get("reason")
+                    wait_time = res.get("wait_time", 100)
+                    release_in_background(lease_from)
+                    lease_from = None
+                    if status == "WAIT":
+                        counts["waits"] += 1
+                        await asyncio.sleep(backoff_delay(wait_time, attempt))
+                        continue
+                    elif status == "DIE":
+                        # Wait-Die preventing deadlock!
+                        counts["dies"] += 1
+                        await asyncio.sleep(backoff_delay(wait_time, attempt))
+                        continue
+                    else:
+                        continue
+                lease_to = res["lease_id"]
+
+                # Critical Section
+                bal_from, ver_from = read_account(acc_from)
+                bal_to, ver_to = read_account(acc_to)
+                await asyncio.sleep(0.1) # Simulate LLM
+                write_account(acc_from, bal_from - 10, ver_from + 1)
+                write_account(acc_to, bal_to + 10, ver_to + 1)
             
-            with metrics_lock:
-                metrics["success"] += 1
-            break
+                counts["success"] += 1
+                break
             
-        finally:
-            if lease_to: klock.release_lease(lease_to)
-            if lease_from: klock.release_lease(lease_from)
+            finally:
+                if lease_to: await aklock.release_lease(lease_to)
+                if lease_from: await aklock.release_lease(lease_from)
+    finally:
+        merge_metrics(metrics, metrics_lock, counts)
 
 
 # ==========================================
 # TEST RUNNER
 # ==========================================
+async def run_async_agents(agent_func, agent_args):
+    try:
+        outcomes = await asyncio.gather(*(agent_func(*args) for args in agent_args), return_exceptions=True)
+        await asyncio.gather(*pending_releases, return_exceptions=True)
+    finally:
+        await aklock.aclose()
+    return [o for o in outcomes if isinstance(o, BaseException)]
+
 def run_benchmark(name, agent_func, extra_args=False):
-    metrics = {"success": 0, "errors": 0, "deadlocks_detected": 0, "aborts": 0, "failed_retries": 0, "waits": 0, "dies": 0}
+    metrics = {"success": 0, "errors": 0, "aborts": 0, "failed_retries": 0, "waits": 0, "dies": 0}
     metrics_lock = threading.Lock()
     
+    agent_args = []
+    for i in range(NUM_AGENTS):
+        agent_id = f"Agent_{i}"
+        acc_from = i
+        acc_to = (i + 1) % NUM_ACCOUNTS # Circular dependency ensures deadlock risk
+        
+        if extra_args:
+            agent_args.append((agent_id, acc_from, acc_to, metrics, metrics_lock, i))
+        else:
+            agent_args.append((agent_id, acc_from, acc_to, metrics, metrics_lock))
+    
     reset_accounts()
     start_time = time.time()
     
-    with ThreadPoolExecutor(max_workers=NUM_AGENTS) as executor:
-        futures = []
-        for i in range(NUM_AGENTS):
-            agent_id = f"Agent_{i}"
-            acc_from = i
-            acc_to = (i + 1) % NUM_ACCOUNTS # Circular dependency ensures deadlock risk
-            
-            if extra_args:
-                futures.append(executor.submit(agent_func, agent_id, acc_from, acc_to, metrics, metrics_lock, i))
-            else:
-                futures.append(executor.submit(agent_func, agent_id, acc_from, acc_to, metrics, metrics_lock))
-        
-        for f in futures:
-            f.result()
+    if inspect.iscoroutinefunction(agent_func):
+        crashes = run_async(run_async_agents(agent_func, agent_args))
+    else:
+        with ThreadPoolExecutor(max_workers=NUM_AGENTS) as executor:
+            futures = [executor.submit(agent_func, *args) for args in agent_args]
+            # One wait for the whole batch; a crashed agent doesn't hide the others
+            done, _ = wait(futures)
+        crashes = [f.exception() for f in done if f.exception() is not None]
             
     end_time = time.time()
     
+    if crashes:
+        metrics["errors"] += len(crashes)
+        print(f"  {len(crashes)} agent(s) crashed: " + "; ".join(repr(e) for e in crashes))
+    
     # Calculate Data Integrity
-    total_balance = 0
-    for i in range(NUM_ACCOUNTS):
-        data = read_account(i)
-        total_balance += data["balance"]
+    flush_accounts()
+    total_balance = sum(read_account(i)[0] for i in range(NUM_ACCOUNTS))
         
     expected_balance = NUM_ACCOUNTS * INITIAL_BALANCE
     data_loss = expected_balance - total_balance
@@ -261,33 +331,41 @@ print("Running Chaos...")
 results.append(run_benchmark("1. Chaos (No Locks)", run_chaos_agent))
 
 print("Running Pessimistic (Mutex)...")
-results.append(run_benchmark("2. Pessimistic (Deadlocks)", run_pessimistic_agent))
+results.append(run_benchmark("2. Pessimistic (Ordered)", run_pessimistic_agent))
 
 print("Running Optimistic (OCC)...")
 results.append(run_benchmark("3. Optimistic (OCC)", run_optimistic_agent))
 
 print("Running Klock (Wait-Die)...")
+klock.list_leases() # Make sure the local daemon is up before the async agents connect
 results.append(run_benchmark("4. Klock (Wait-Die)", run_klock_agent, extra_args=True))
+close_account_files()
 
 print("\n📊 === FINAL RESULTS COMPARISON === 📊\n")
 print(f"{'Algorithm':<28} | {'Time (s)':<8} | {'Success':<7} | {'Data Loss':<10} | {'Key Metrics'}")
 print("-" * 85)
-for r in results:
+RESULT_ROW = "{:<28} | {:<8.2f} | {:<7} | {:<10} | {}\n"
+KEY_METRICS = (
+    ("errors", "Errors"),
+    ("aborts", "Collision Aborts"),
+    ("failed_retries", "Exhausted Retries"),
+    ("waits", "Waits (Senior)"),
+    ("dies", "Dies (Junior)"),
+)
+
+def describe_metrics(r):
+    if r["data_loss"]:
+        return "RACE CONDITION CORRUPTION"
     m = r["metrics"]
-    key_metrics = []
-    if m["deadlocks_detected"] > 0: key_metrics.append(f"{m['deadlocks_detected']} Deadlocks")
-    if m["aborts"] > 0: key_metrics.append(f"{m['aborts']} Collision Aborts")
-    if m["failed_retries"] > 0: key_metrics.append(f"{m['failed_retries']} Exhausted Retries")
-    if m["waits"] > 0: key_metrics.append(f"{m['waits']} Waits (Senior)")
-    if m["dies"] > 0: key_metrics.append(f"{m['dies']} Dies (Junior)")
-    
-    metrics_str = ", ".join(key_metrics) if key_metrics else "Clean execution"
-    if r['data_loss']: metrics_str = "RACE CONDITION CORRUPTION"
-    
-    print(f"{r['name']:<28} | {r['time']:<8.2f} | {r['success']:<7} | {str(r['data_loss']):<10} | {metrics_str}")
+    return ", ".join(f"{m[key]} {label}" for key, label in KEY_METRICS if m[key] > 0) or "Clean execution"
+
+sys.stdout.writelines(
+    RESULT_ROW.format(r["name"], r["time"], r["success"], str(r["data_loss"]), describe_metrics(r))
+    for r in results
+)
 
 print("\n💡 Summary:")
 print("- Chaos corrupts data due to race conditions.")
-print("- Pessimistic Locking deadlocks (threads freeze and timeout) because of circular dependencies.")
+print("- Pessimistic Locking avoids deadlocks only by imposing a global lock order, serializing every overlapping transfer.")
 print("- Optimistic (OCC) prevents corruption but burns massive compute violently aborting and retrying.")
 print("- Klock uses Wait-Die to deterministically yield, preventing deadlocks without exploding retries.")
@@ -1,11 +1,11 @@
 import os
 import time
-import json
 import threading
-from typing import Optional, Type, Dict, Any
+from typing import Optional, Type, Dict, Any, Callable
 
+import orjson
 from langchain_core.tools import BaseTool
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 
 from klock_langchain import klock_protected
@@ -13,7 +13,7 @@ from klock_langchain import klock_protected
 # ==========================================
 # 1. SETUP KLOCK CLIENT & AGENTS
 # ==========================================
-from klock import KlockHttpClient
+from klock_langchain.client import KlockHttpClient
 
 # Connect to the local Klock daemon (klock-cli serve)
 klock = KlockHttpClient()
@@ -25,8 +25,8 @@ klock.register_agent("agent_B", 200)
 DB_FILE = "database.json"
 
 def reset_db():
-    with open(DB_FILE, "w") as f:
-        json.dump([], f)
+    with open(DB_FILE, "wb") as f:
+        f.write(orjson.dumps([]))
 
 # ==========================================
 # 2. DEFINE LANGCHAIN TOOLS
@@ -43,38 +43,42 @@ class ProtectedAppendAuthorTool(BaseTool):
     agent_id: str
     session_id: str
 
-    def _run(self, author_name: str, run_manager=None) -> str:
-        # Dynamically apply the klock decorator just for this invocation 
-        # (This is simulating our @klock_protected decorator)
-        decorator = klock_protected(
-            klock_client=klock,
-            agent_id=self.agent_id,
-            session_id=self.session_id,
-            resource_type="FILE",
-            resource_path_extractor=lambda kwargs: DB_FILE,
-            predicate="MUTATES"
-        )
+    # The klock-protected critical section, built once per tool instance
+    _protected: Optional[Callable[..., str]] = PrivateAttr(default=None)
+
+    def _critical_section(self, author_name: str) -> str:
+        print(f"[{self.agent_id}] 🔒 Lease Acquired. Reading {DB_FILE}...")
+        # Read
+        with open(DB_FILE, "rb") as f:
+            data = orjson.loads(f.read())
         
-        @decorator
-        def critical_section(author_name=author_name):
-            print(f"[{self.agent_id}] 🔒 Lease Acquired. Reading {DB_FILE}...")
-            # Read
-            with open(DB_FILE, "r") as f:
-                data = json.load(f)
-            
-            # Simulate processing time (creates the race condition)
-            print(f"[{self.agent_id}] Processing...")
-            time.sleep(2)
-            
-            # Write
-            data.append(author_name)
-            with open(DB_FILE, "w") as f:
-                json.dump(data, f)
-            print(f"[{self.agent_id}] 🔓 Saved. Lease Released.")
-            return f"Successfully appended {author_name}"
+        # Simulate processing time (creates the race condition)
+        print(f"[{self.agent_id}] Processing...")
+        time.sleep(2)
+        
+        # Write
+        data.append(author_name)
+        with open(DB_FILE, "wb") as f:
+            f.write(orjson.dumps(data))
+        print(f"[{self.agent_id}] 🔓 Saved. Lease Released.")
+        return f"Successfully appended {author_name}"
+
+    def _get_protected(self) -> Callable[..., str]:
+        if self._protected is None:
+            decorator = klock_protected(
+                klock_client=klock,
+                agent_id=self.agent_id,
+                session_id=self.session_id,
+                resource_type="FILE",
+                resource_path_extractor=lambda kwargs: DB_FILE,
+                predicate="MUTATES"
+            )
+            self._protected = decorator(self._critical_section)
+        return self._protected
 
+    def _run(self, author_name: str, run_manager=None) -> str:
         try:
-            return critical_section(author_name=author_name)
+            return self._get_protected()(author_name=author_name)
         except Exception as e:
             return f"Error: Tool execution halted. {str(e)}"
 
@@ -141,9 +145,9 @@ def main():
     thread_b.join()
     
     print("\n=== FINAL DATABASE STATE ===")
-    with open(DB_FILE, "r") as f:
-        data = json.load(f)
-        print(json.dumps(data, indent=2))
+    with open(DB_FILE, "rb") as f:
+        data = orjson.loads(f.read())
+        print(orjson.dumps(data, option=orjson.OPT_INDENT_2).decode())
         
     if len(data) == 2:
         print("✅ SUCCESS: Zero Data Loss. Klock prevented the Multi-Agent Race Condition (MARC).")
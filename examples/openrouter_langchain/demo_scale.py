@@ -1,22 +1,29 @@
 import os
 import time
-import json
+import asyncio
+import functools
 import threading
-from typing import Type
-from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Type
 
+import orjson
 from langchain_core.tools import BaseTool
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 
 from klock_langchain import klock_protected
 import requests
 
+try:
+    import uvloop
+    run_async = uvloop.run
+except ModuleNotFoundError:  # uvloop is optional; fall back to the stock asyncio loop
+    run_async = asyncio.run
+
 # ==========================================
 # 1. SETUP KLOCK HTTP CLIENT
 # ==========================================
-from klock import KlockHttpClient
+from klock_langchain.client import KlockHttpClient
 klock = KlockHttpClient()
 
 # ==========================================
@@ -35,8 +42,8 @@ metrics_lock = threading.Lock()
 
 def reset_dbs():
     for f in FILES:
-        with open(f, "w") as file:
-            json.dump([], file)
+        with open(f, "wb") as file:
+            file.write(orjson.dumps([]))
 
 # ==========================================
 # 3. DEFINE DYNAMIC LANGCHAIN TOOL
@@ -53,41 +60,47 @@ class ProtectedWriteTool(BaseTool):
     agent_id: str
     session_id: str
 
+    # The klock-protected critical section, built once per tool instance
+    _protected: Optional[Callable[..., str]] = PrivateAttr(default=None)
+
+    def _critical_section(self, file_name: str, data_entry: str) -> str:
+        # Read
+        with open(file_name, "rb") as f:
+            data = orjson.loads(f.read())
+        
+        # Simulate processing time to force collisions
+        time.sleep(1.0)
+        
+        # Write
+        data.append(data_entry)
+        with open(file_name, "wb") as f:
+            f.write(orjson.dumps(data))
+        return f"Successfully wrote '{data_entry}' to {file_name}"
+
+    def _get_protected(self) -> Callable[..., str]:
+        if self._protected is None:
+            # Protect whichever file the LLM chose, read from the call's kwargs
+            decorator = klock_protected(
+                klock_client=klock,
+                agent_id=self.agent_id,
+                session_id=self.session_id,
+                resource_type="FILE",
+                resource_path_extractor=lambda kwargs: kwargs["file_name"],
+                predicate="MUTATES"
+            )
+            self._protected = decorator(self._critical_section)
+        return self._protected
+
     def _run(self, file_name: str, data_entry: str, run_manager=None) -> str:
         if file_name not in FILES:
             return f"Error: Invalid file {file_name}"
 
-        # Dynamically protect the specific file the LLM chose
-        decorator = klock_protected(
-            klock_client=klock,
-            agent_id=self.agent_id,
-            session_id=self.session_id,
-            resource_type="FILE",
-            resource_path_extractor=lambda kwargs: file_name,
-            predicate="MUTATES"
-        )
-        
-        @decorator
-        def critical_section(file_name=file_name, data_entry=data_entry):
-            # Read
-            with open(file_name, "r") as f:
-                data = json.load(f)
-            
-            # Simulate processing time to force collisions
-            time.sleep(1.0)
-            
-            # Write
-            data.append(data_entry)
-            with open(file_name, "w") as f:
-                json.dump(data, f)
-            return f"Successfully wrote '{data_entry}' to {file_name}"
-
         # Only count it as an attempted write if the LLM successfully called the tool
         with metrics_lock:
             metrics["attempted_writes"] += 1
             
         try:
-            result = critical_section(file_name=file_name, data_entry=data_entry)
+            result = self._get_protected()(file_name=file_name, data_entry=data_entry)
             with metrics_lock:
                 metrics["successful_writes"] += 1
             return result
@@ -100,38 +113,45 @@ class ProtectedWriteTool(BaseTool):
 # ==========================================
 # 4. CONFIGURE OPENROUTER AGENT
 # ==========================================
-def run_agent_workflow(agent_idx: int):
-    # Register agent with priority (lower idx = higher priority)
-    agent_id = f"Agent_{agent_idx}"
-    klock.register_agent(agent_id, priority=agent_idx)
-    
-    # We will ask this agent to write to TWO different files to create complex cross-file contention
-    target_file_1 = FILES[agent_idx % len(FILES)]
-    target_file_2 = FILES[(agent_idx + 1) % len(FILES)]
-    
+@functools.cache
+def get_llm_with_tools():
+    # One shared client for every agent. The bound tool schema doesn't depend on the
+    # agent; each agent still executes calls through its own ProtectedWriteTool.
     llm = ChatOpenAI(
         base_url="https://openrouter.ai/api/v1",
         api_key=os.environ.get("OPENROUTER_API_KEY"),
         model="openai/gpt-oss-20b:free",
         temperature=0.1
     )
+    return llm.bind_tools([ProtectedWriteTool(agent_id="planner", session_id="planner")])
+
+async def run_agent_workflow(agent_idx: int):
+    agent_id = f"Agent_{agent_idx}"
+    
+    # We will ask this agent to write to TWO different files to create complex cross-file contention
+    target_file_1 = FILES[agent_idx % len(FILES)]
+    target_file_2 = FILES[(agent_idx + 1) % len(FILES)]
     
     tool = ProtectedWriteTool(agent_id=agent_id, session_id=f"session_{agent_id}")
-    llm_with_tools = llm.bind_tools([tool])
+    llm_with_tools = get_llm_with_tools()
     
     tasks = [
         f"Append 'Task 1 from {agent_id}' to {target_file_1}. Use the write_to_database tool. Reply with the tool call only.",
         f"Append 'Task 2 from {agent_id}' to {target_file_2}. Use the write_to_database tool. Reply with the tool call only."
     ]
     
-    for task in tasks:
-        print(f"[{agent_id}] ⏳ Planning...")
+    # Plan both tasks in one concurrent batch instead of two sequential round-trips
+    print(f"[{agent_id}] ⏳ Planning...")
+    responses = await llm_with_tools.abatch(tasks, return_exceptions=True)
+    
+    for response in responses:
         try:
-            response = llm_with_tools.invoke(task)
+            if isinstance(response, Exception):
+                raise response
             if response.tool_calls:
                 tc = response.tool_calls[0]
                 print(f"[{agent_id}] 🧠 Decided to write to {tc['args']['file_name']}")
-                tool.invoke(tc["args"])
+                await tool.ainvoke(tc["args"])
             else:
                 print(f"[{agent_id}] ❌ Did not return a tool call.")
         except Exception as e:
@@ -139,6 +159,9 @@ def run_agent_workflow(agent_idx: int):
             with metrics_lock:
                 metrics["llm_api_errors"] += 1
 
+async def run_all_agents():
+    await asyncio.gather(*(run_agent_workflow(i) for i in range(NUM_AGENTS)))
+
 # ==========================================
 # 5. EXECUTION & METRICS
 # ==========================================
@@ -152,11 +175,13 @@ def main():
     
     start_time = time.time()
     
-    # Run all agents concurrently in a thread pool
-    with ThreadPoolExecutor(max_workers=NUM_AGENTS) as executor:
-        futures = [executor.submit(run_agent_workflow, i) for i in range(NUM_AGENTS)]
-        for f in futures:
-            f.result() # Wait for all to finish
+    # Register agents with priority (lower idx = higher priority) before the event loop
+    # starts: the native client blocks, and may auto-start the server on first use
+    for i in range(NUM_AGENTS):
+        klock.register_agent(f"Agent_{i}", priority=i)
+    
+    # Run all agents concurrently on one event loop; tool calls run in its executor
+    run_async(run_all_agents())
             
     end_time = time.time()
     metrics["total_time"] = end_time - start_time
@@ -174,8 +199,8 @@ def main():
     print("\n📁 === FINAL FILE VERIFICATION ===")
     total_entries_verified = 0
     for file in FILES:
-        with open(file, "r") as f:
-            data = json.load(f)
+        with open(file, "rb") as f:
+            data = orjson.loads(f.read())
             total_entries_verified += len(data)
             print(f"- {file}: {len(data)} entries")
             
@@ -1,3 +1,3 @@
-from .tool import KlockConflictError, klock_protected
+from .tool import KlockConflictError, backoff_delay, klock_protected
 
-__all__ = ["KlockConflictError", "klock_protected"]
+__all__ = ["KlockConflictError", "backoff_delay", "klock_protected"]
@@ -0,0 +1,141 @@
+import importlib.util
+from typing import Any, Dict, Optional
+
+try:
+    import httpx
+except ModuleNotFoundError:  # pragma: no cover - optional dependency for AsyncKlockHttpClient
+    httpx = None
+
+__all__ = ["AsyncKlockHttpClient", "KlockHttpClient"]
+
+
+def __getattr__(name: str) -> Any:
+    # The native client is re-exported lazily so the pure-Python async client
+    # imports without the compiled klock extension.
+    if name == "KlockHttpClient":
+        from klock import KlockHttpClient
+
+        return KlockHttpClient
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class AsyncKlockHttpClient:
+    """
+    An asyncio client for the lease endpoints of a running Klock server.
+
+    Mirrors the lease methods of the native `KlockHttpClient` as coroutines. Unlike the
+    native client it never auto-starts a local server.
+
+    Args:
+        base_url: Base URL of the Klock server. Default: "http://localhost:3100".
+        api_key: Optional bearer token sent with every request.
+        timeout_s: Per-request timeout in seconds. Default: 5s.
+        http2: Multiplex every request over a single HTTP/2 connection (prior knowledge, no
+            HTTP/1.1 fallback). Needs a server built with axum's `http2` feature. Default: False.
+        client: An existing httpx.AsyncClient to use instead of creating one on first request.
+            The caller keeps ownership of it: `aclose()` leaves it open.
+    """
+
+    def __init__(
+        self,
+        base_url: str = "http://localhost:3100",
+        api_key: Optional[str] = None,
+        timeout_s: float = 5.0,
+        http2: bool = False,
+        client: Optional[Any] = None,
+    ):
+        if httpx is None:
+            raise ModuleNotFoundError(
+                "AsyncKlockHttpClient requires httpx. Install it with: pip install 'klock-langchain[async]'"
+            )
+        if http2 and client is None and importlib.util.find_spec("h2") is None:
+            raise ModuleNotFoundError(
+                "AsyncKlockHttpClient(http2=True) requires h2. Install it with: pip install 'klock-langchain[async]'"
+            )
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.timeout_s = timeout_s
+        self.http2 = http2
+        self._http = client
+        self._owns_http = client is None
+
+    def _client(self):
+        # Created lazily so the client binds to the event loop that first uses it.
+        if self._http is None:
+            headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else None
+            options = {}
+            if self.http2:
+                # HTTP/2 over plain http:// needs prior knowledge (http1=False); every
+                # request then shares one multiplexed connection.
+                options = {
+                    "http1": False,
+                    "http2": True,
+                    "limits": httpx.Limits(max_connections=1, max_keepalive_connections=1),
+                }
+            self._http = httpx.AsyncClient(base_url=self.base_url, headers=headers, timeout=self.timeout_s, **options)
+        return self._http
+
+    async def register_agent(self, agent_id: str, priority: int) -> None:
+        payload = _read_json(await self._client().post("/agents", json={"agent_id": agent_id, "priority": priority}))
+        if not payload.get("success"):
+            raise RuntimeError(payload.get("error") or payload.get("reason") or "Unknown Klock server error")
+
+    async def acquire_lease(
+        self,
+        agent_id: str,
+        session_id: str,
+        resource_type: str,
+        resource_path: str,
+        predicate: str,
+        ttl: int,
+        priority: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        body = {
+            "agent_id": agent_id,
+            "session_id": session_id,
+            "resource_type": resource_type,
+            "resource_path": resource_path,
+            "predicate": predicate,
+            "ttl": ttl,
+        }
+        if priority is not None:
+            body["priority"] = priority
+        payload = _read_json(await self._client().post("/leases", json=body))
+        return _lease_result(payload)
+
+    async def release_lease(self, lease_id: str) -> bool:
+        payload = _read_json(await self._client().delete(f"/leases/{lease_id}"))
+        return bool(payload.get("success"))
+
+    async def aclose(self) -> None:
+        """Close a connection this client created. It reconnects if used again."""
+        if self._owns_http and self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+
+def _read_json(response: Any) -> Dict[str, Any]:
+    """Parse a response body like the native client: empty is {}, anything unparseable raises."""
+    if not response.text.strip():
+        return {}
+    try:
+        return response.json()
+    except ValueError as err:
+        raise RuntimeError(f"Failed to parse Klock response JSON: {err}") from err
+
+
+def _lease_result(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape a POST /leases response like the native client's acquire_lease result."""
+    if payload.get("success"):
+        data = payload.get("data") or {}
+        result = {"success": True}
+        for key in ("lease_id", "agent_id", "resource", "predicate", "expires_at"):
+            if key in data:
+                result[key] = data[key]
+        return result
+
+    return {
+        "success": False,
+        "reason": payload.get("reason") or "CONFLICT",
+        "wait_time": payload.get("wait_time") or 1000,
+    }
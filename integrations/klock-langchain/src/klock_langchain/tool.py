@@ -1,4 +1,5 @@
 import time
+import random
 import functools
 from typing import Any, Callable, Dict, Optional
 
@@ -85,6 +86,11 @@ def klock_protected(
 
     return decorator
 
+def backoff_delay(wait_ms: int, attempt: int, cap_s: float = 2.0) -> float:
+    """Jittered WAIT delay in seconds, growing exponentially from the server hint up to cap_s."""
+    base = wait_ms / 1000.0
+    return random.uniform(base, max(base, min(cap_s, base * 3 ** attempt)))
+
 def _acquire_lock_with_wait_die(klock_client, agent_id, session_id, resource_type, resource_path, predicate, ttl_ms, max_retries):
     """Internal helper to repeatedly attempt lock acquisition according to Wait-Die rules."""
     retries = 0
@@ -105,8 +111,10 @@ def _acquire_lock_with_wait_die(klock_client, agent_id, session_id, resource_typ
             if wait_ms is None:
                 wait_ms = 1000
                 
-            time.sleep(wait_ms / 1000.0)
-            total_wait_ms += wait_ms
+            # Jitter desynchronizes senior agents so they don't all retry at once.
+            delay = backoff_delay(wait_ms, retries)
+            time.sleep(delay)
+            total_wait_ms += int(delay * 1000)
             retries += 1
         elif reason == "DIE":
             # Junior agent aborts to prevent deadlock.
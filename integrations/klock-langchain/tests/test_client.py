@@ -0,0 +1,90 @@
+import asyncio
+import json
+import unittest
+from unittest import mock
+
+try:
+    import httpx
+    from klock_langchain.client import AsyncKlockHttpClient
+except ModuleNotFoundError:  # pragma: no cover - needs the async extra
+    httpx = None
+
+
+@unittest.skipIf(httpx is None, "AsyncKlockHttpClient requires httpx")
+class AsyncKlockHttpClientTests(unittest.TestCase):
+    def _client(self, handler):
+        self.requests = []
+
+        def record(request):
+            self.requests.append(request)
+            return handler(request)
+
+        http = httpx.AsyncClient(base_url="http://klock.test", transport=httpx.MockTransport(record))
+        self.addCleanup(asyncio.run, http.aclose())
+        return AsyncKlockHttpClient("http://klock.test", client=http)
+
+    def test_acquire_sends_priority_and_returns_lease(self):
+        client = self._client(
+            lambda request: httpx.Response(
+                201,
+                json={"success": True, "data": {"lease_id": "lease-1", "agent_id": "agent-1", "resource": "FILE:/a"}},
+            )
+        )
+
+        result = asyncio.run(client.acquire_lease("agent-1", "session-1", "FILE", "/a", "MUTATES", 5000, priority=7))
+
+        self.assertEqual(result, {"success": True, "lease_id": "lease-1", "agent_id": "agent-1", "resource": "FILE:/a"})
+        body = json.loads(self.requests[0].content)
+        self.assertEqual(self.requests[0].url.path, "/leases")
+        self.assertEqual(body["priority"], 7)
+
+    def test_denied_acquire_returns_reason_and_wait_time(self):
+        client = self._client(
+            lambda request: httpx.Response(409, json={"success": False, "reason": "WAIT", "wait_time": None})
+        )
+
+        result = asyncio.run(client.acquire_lease("agent-1", "session-1", "FILE", "/a", "MUTATES", 5000))
+
+        self.assertEqual(result, {"success": False, "reason": "WAIT", "wait_time": 1000})
+        self.assertNotIn("priority", json.loads(self.requests[0].content))
+
+    def test_release_deletes_lease(self):
+        client = self._client(lambda request: httpx.Response(200, json={"success": True, "data": "released"}))
+
+        released = asyncio.run(client.release_lease("lease-1"))
+
+        self.assertTrue(released)
+        self.assertEqual(self.requests[0].method, "DELETE")
+        self.assertEqual(self.requests[0].url.path, "/leases/lease-1")
+
+    def test_empty_401_is_a_failed_lease(self):
+        client = self._client(lambda request: httpx.Response(401))
+
+        result = asyncio.run(client.acquire_lease("agent-1", "session-1", "FILE", "/a", "MUTATES", 5000))
+        released = asyncio.run(client.release_lease("lease-1"))
+
+        self.assertEqual(result, {"success": False, "reason": "CONFLICT", "wait_time": 1000})
+        self.assertFalse(released)
+
+    def test_non_json_error_raises_runtime_error(self):
+        client = self._client(lambda request: httpx.Response(422, text="Failed to deserialize the JSON body"))
+
+        with self.assertRaisesRegex(RuntimeError, "Failed to parse Klock response JSON"):
+            asyncio.run(client.acquire_lease("agent-1", "session-1", "FILE", "/a", "MUTATES", 5000))
+
+    def test_aclose_leaves_injected_client_open(self):
+        client = self._client(lambda request: httpx.Response(200, json={"success": True}))
+
+        asyncio.run(client.aclose())
+
+        self.assertTrue(asyncio.run(client.release_lease("lease-1")))
+        self.assertEqual(len(self.requests), 1)
+
+    def test_http2_without_h2_raises_install_hint(self):
+        with mock.patch("importlib.util.find_spec", return_value=None):
+            with self.assertRaisesRegex(ModuleNotFoundError, "klock-langchain\\[async\\]"):
+                AsyncKlockHttpClient("http://klock.test", http2=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
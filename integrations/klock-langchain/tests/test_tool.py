@@ -74,6 +74,33 @@ class KlockProtectedTests(unittest.TestCase):
         sleep_mock.assert_called_once_with(0.25)
         self.assertEqual(client.release_calls, ["lease-2"])
 
+    @patch("klock_langchain.tool.random.uniform", side_effect=lambda low, high: high)
+    @patch("klock_langchain.tool.time.sleep")
+    def test_repeated_waits_back_off_with_cap(self, sleep_mock, _uniform_mock):
+        client = FakeKlockClient(
+            [
+                {"success": False, "reason": "WAIT", "wait_time": 250},
+                {"success": False, "reason": "WAIT", "wait_time": 250},
+                {"success": False, "reason": "WAIT", "wait_time": 250},
+                {"success": True, "lease_id": "lease-5"},
+            ]
+        )
+
+        @klock_protected(
+            klock_client=client,
+            agent_id="agent-1",
+            session_id="session-1",
+            resource_type="FILE",
+            resource_path_extractor=lambda kwargs: kwargs["path"],
+        )
+        def write_file(path):
+            return path
+
+        write_file(path="/tmp/auth.ts")
+
+        delays = [call.args[0] for call in sleep_mock.call_args_list]
+        self.assertEqual(delays, [0.25, 0.75, 2.0])
+
     def test_die_raises_conflict_error(self):
         client = FakeKlockClient([{"success": False, "reason": "DIE", "wait_time": 1000}])
 
@@ -61,6 +61,10 @@ pub struct AcquireLeaseRequest {
     pub resource_path: String,
     pub predicate: String,
     pub ttl: u64,
+    /// Optional Wait-Die priority; when present an agent that has no priority
+    /// yet is registered before the lease is evaluated, saving a separate
+    /// `POST /agents`. An existing registration is left untouched.
+    pub priority: Option<u64>,
 }
 
 impl AcquireLeaseRequest {
@@ -141,6 +141,13 @@ async fn acquire_lease(
     }
 
     let mut client = state.lock().await;
+    // Lazy registration: only an unknown agent is registered, so repeat acquires
+    // don't rewrite the priority (an INSERT OR REPLACE on the sqlite backend).
+    if let Some(priority) = req.priority {
+        if client.agent_priority(&req.agent_id).is_none() {
+            client.register_agent(&req.agent_id, priority);
+        }
+    }
     let result = client.acquire_lease(
         &req.agent_id,
         &req.session_id,
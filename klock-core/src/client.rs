@@ -22,6 +22,7 @@ fn now_ms() -> u64 {
 pub trait LeaseStoreExt: LeaseStore {
     fn register_agent_priority(&mut self, agent_id: String, priority: u64);
     fn get_priorities(&self) -> HashMap<String, u64>;
+    fn get_agent_priority(&self, agent_id: &str) -> Option<u64>;
 }
 
 impl LeaseStoreExt for InMemoryLeaseStore {
@@ -31,6 +32,9 @@ impl LeaseStoreExt for InMemoryLeaseStore {
     fn get_priorities(&self) -> HashMap<String, u64> {
         InMemoryLeaseStore::get_priorities(self)
     }
+    fn get_agent_priority(&self, agent_id: &str) -> Option<u64> {
+        InMemoryLeaseStore::get_agent_priority(self, agent_id)
+    }
 }
 
 #[cfg(feature = "sqlite")]
@@ -43,6 +47,9 @@ impl LeaseStoreExt for crate::infrastructure_sqlite::SqliteLeaseStore {
     fn get_priorities(&self) -> HashMap<String, u64> {
         crate::infrastructure_sqlite::SqliteLeaseStore::get_priorities(self)
     }
+    fn get_agent_priority(&self, agent_id: &str) -> Option<u64> {
+        crate::infrastructure_sqlite::SqliteLeaseStore::get_agent_priority(self, agent_id)
+    }
 }
 
 /// The main entry point for using Klock. Manages agents, leases, and
@@ -85,6 +92,11 @@ impl KlockClient {
             .register_agent_priority(agent_id.to_string(), priority);
     }
 
+    /// Look up a registered agent's priority, if it has one.
+    pub fn agent_priority(&self, agent_id: &str) -> Option<u64> {
+        self.store.get_agent_priority(agent_id)
+    }
+
     /// Declare an intent manifest and get a kernel verdict.
     /// This checks for conflicts and applies Wait-Die scheduling.
     pub fn declare_intent(&mut self, manifest: &IntentManifest) -> KernelVerdict {
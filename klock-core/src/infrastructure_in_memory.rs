@@ -25,6 +25,10 @@ impl InMemoryLeaseStore {
     pub fn get_priorities(&self) -> HashMap<String, u64> {
         self.priorities.clone()
     }
+
+    pub fn get_agent_priority(&self, agent_id: &str) -> Option<u64> {
+        self.priorities.get(agent_id).copied()
+    }
 }
 
 impl LeaseStore for InMemoryLeaseStore {
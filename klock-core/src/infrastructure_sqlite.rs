@@ -85,6 +85,11 @@ impl SqliteLeaseStore {
         self.priorities.clone()
     }
 
+    /// Look up one agent's priority without cloning the map.
+    pub fn get_agent_priority(&self, agent_id: &str) -> Option<u64> {
+        self.priorities.get(agent_id).copied()
+    }
+
     fn parse_predicate(s: &str) -> Predicate {
         match s {
             "Provides" => Predicate::Provides,
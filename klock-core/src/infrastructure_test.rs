@@ -76,4 +76,13 @@ mod tests {
         assert_eq!(store.evict_expired(7000), 1);
         assert_eq!(store.get_active_leases().len(), 0);
     }
+
+    #[test]
+    fn test_in_memory_store_agent_priority_lookup() {
+        let mut store = InMemoryLeaseStore::new();
+        assert_eq!(store.get_agent_priority("agent_1"), None);
+
+        store.register_agent_priority("agent_1".to_string(), 100);
+        assert_eq!(store.get_agent_priority("agent_1"), Some(100));
+    }
 }
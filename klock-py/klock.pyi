@@ -109,6 +109,7 @@ class KlockHttpClient:
         resource_path: str,
         predicate: str,
         ttl: int,
+        priority: Optional[int] = None,
     ) -> dict[str, object]:
         ...
 
@@ -11,6 +11,9 @@ use serde_json::{json, Value};
 use ::klock_core::client::KlockClient as RustClient;
 use ::klock_core::types::{LeaseFailureReason, LeaseResult as RustLeaseResult};
 
+/// Idle keep-alive connections retained by the shared HTTP agent.
+const MAX_IDLE_CONNECTIONS: usize = 64;
+
 /// The Klock coordination client for Python.
 /// Manages agent registration, lease acquisition, and conflict resolution.
 #[pyclass(unsendable)]
@@ -23,13 +26,14 @@ pub struct KlockClient {
 pub struct KlockHttpClient {
     base_url: String,
     api_key: Option<String>,
-    timeout_ms: u64,
     auto_start: bool,
     auto_start_disabled_by_env: bool,
     startup_timeout_ms: u64,
     server_command: Vec<String>,
     auto_start_attempted: Mutex<bool>,
     last_started_pid: Mutex<Option<u32>>,
+    /// Shared agent so keep-alive connections are pooled across calls and threads.
+    agent: ureq::Agent,
 }
 
 #[pymethods]
@@ -107,16 +111,21 @@ impl KlockHttpClient {
         server_command: Option<Vec<String>>,
     ) -> Self {
         let auto_start_disabled_by_env = auto_start_disabled_by_env();
+        let agent = ureq::AgentBuilder::new()
+            .timeout(Duration::from_millis(timeout_ms))
+            .max_idle_connections(MAX_IDLE_CONNECTIONS)
+            .max_idle_connections_per_host(MAX_IDLE_CONNECTIONS)
+            .build();
         Self {
             base_url: base_url.trim_end_matches('/').to_string(),
             api_key,
-            timeout_ms,
             auto_start: auto_start && !auto_start_disabled_by_env,
             auto_start_disabled_by_env,
             startup_timeout_ms,
             server_command: server_command.unwrap_or_else(default_server_command),
             auto_start_attempted: Mutex::new(false),
             last_started_pid: Mutex::new(None),
+            agent,
         }
     }
 
@@ -158,6 +167,8 @@ impl KlockHttpClient {
     }
 
     /// Acquire a lease from the Klock server.
+    /// Passing `priority` registers a not-yet-registered agent in the same request.
+    #[pyo3(signature = (agent_id, session_id, resource_type, resource_path, predicate, ttl, priority = None))]
     pub fn acquire_lease<'py>(
         &self,
         py: Python<'py>,
@@ -167,19 +178,21 @@ impl KlockHttpClient {
         resource_path: &str,
         predicate: &str,
         ttl: u64,
+        priority: Option<u64>,
     ) -> PyResult<Bound<'py, PyDict>> {
-        let response = self.request_json(
-            "POST",
-            "/leases",
-            Some(json!({
-                "agent_id": agent_id,
-                "session_id": session_id,
-                "resource_type": resource_type,
-                "resource_path": resource_path,
-                "predicate": predicate,
-                "ttl": ttl,
-            })),
-        )?;
+        let mut payload = json!({
+            "agent_id": agent_id,
+            "session_id": session_id,
+            "resource_type": resource_type,
+            "resource_path": resource_path,
+            "predicate": predicate,
+            "ttl": ttl,
+        });
+        if let Some(priority) = priority {
+            payload["priority"] = json!(priority);
+        }
+
+        let response = self.request_json("POST", "/leases", Some(payload))?;
 
         if response
             .get("success")
@@ -305,14 +318,10 @@ impl KlockHttpClient {
         }
 
         let url = format!("{}{}", self.base_url, path);
-        let agent = ureq::AgentBuilder::new()
-            .timeout(Duration::from_millis(self.timeout_ms))
-            .build();
-
         let request = match method {
-            "GET" => agent.get(&url),
-            "POST" => agent.post(&url),
-            "DELETE" => agent.delete(&url),
+            "GET" => self.agent.get(&url),
+            "POST" => self.agent.post(&url),
+            "DELETE" => self.agent.delete(&url),
             _ => {
                 return Err(PyRuntimeError::new_err(format!(
                     "Unsupported Klock HTTP method '{}'",
@@ -449,16 +458,12 @@ impl KlockHttpClient {
     }
 
     fn health_check(&self) -> Result<(), ureq::Error> {
-        let agent = ureq::AgentBuilder::new()
-            .timeout(Duration::from_millis(self.timeout_ms))
-            .build();
-
         let request = if let Some(api_key) = &self.api_key {
-            agent
+            self.agent
                 .get(&format!("{}/health", self.base_url))
                 .set("Authorization", &format!("Bearer {}", api_key))
         } else {
-            agent.get(&format!("{}/health", self.base_url))
+            self.agent.get(&format!("{}/health", self.base_url))
         };
 
         match request.call() {